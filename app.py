@@ -1,24 +1,94 @@
 import os
-from flask import Flask, render_template, request, jsonify
+from flask import Blueprint, Flask, Response, abort, render_template, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from tinya51 import TinyA51, char_to_binary, binary_to_char, validate_key, validate_binary_data, validate_char_data
-import json
+import orjson
 
-app = Flask(__name__)
-CORS(app)  # Bật CORS cho phát triển local
 
+class ORJSONProvider(JSONProvider):
+    """Mã hóa/giải mã JSON bằng orjson thay cho thư viện json chuẩn."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+bp = Blueprint('tinya51', __name__)
+
+# Giới hạn kích thước: thân request, số bit dữ liệu và số bit ở chế độ chi tiết
+# (mỗi bước chi tiết tạo một từ điển nên giới hạn chặt hơn)
+MAX_CONTENT_LENGTH = 1 << 20
+MAX_BITS = 1 << 20
+MAX_BITS_VERBOSE = 4096
+
+
+def create_app():
+    """Tạo và cấu hình ứng dụng Flask."""
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+    app.json = ORJSONProvider(app)
+    CORS(app)  # Bật CORS cho phát triển local
+    app.register_blueprint(bp)
+    return app
+
+
+@bp.before_app_request
+def _limit_content_length():
+    """Từ chối sớm thân request vượt quá MAX_CONTENT_LENGTH, trước khi vào các endpoint."""
+    if request.content_length is not None and request.content_length > MAX_CONTENT_LENGTH:
+        abort(413)
+
+
+def _read_json():
+    """Đọc thân request dạng JSON trực tiếp bằng orjson."""
+    return orjson.loads(request.get_data(cache=False))
+
+
+def _stream_steps(cipher, binary_data, header, result_field, input_format):
+    """
+    Gửi thông tin từng bước dưới dạng NDJSON (mỗi dòng một đối tượng JSON).
+    
+    Dòng đầu là thông tin chung và trạng thái ban đầu, tiếp theo mỗi bước một dòng,
+    dòng cuối chứa kết quả. Các bước được sinh và gửi dần thay vì dựng cả danh sách.
+    """
+    steps = cipher.iter_steps(binary_data)
+    header['initial_state'] = cipher.get_initial_state()
+    
+    def generate():
+        yield orjson.dumps(header) + b'\n'
+        
+        # Ghi mã ASCII của từng bit mã vào bộ đệm cấp phát sẵn, giải mã thành chuỗi một lần ở cuối
+        out = bytearray(len(binary_data))
+        for i, step in enumerate(steps):
+            out[i] = 48 | step['cipher_bit']
+            yield orjson.dumps(step) + b'\n'
+        
+        result = out.decode('ascii')
+        trailer = {result_field: result}
+        if input_format == 'char':
+            try:
+                trailer[f'{result_field}_char'] = binary_to_char(result)
+            except ValueError:
+                trailer[f'{result_field}_char'] = None
+        yield orjson.dumps(trailer) + b'\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
-@app.route('/')
+
+@bp.route('/')
 def index():
     """Phục vụ giao diện web chính."""
     return render_template('index.html')
 
 
-@app.route('/api/encrypt', methods=['POST'])
+@bp.route('/api/encrypt', methods=['POST'])
 def encrypt():
     """Mã hóa plaintext bằng TinyA5/1."""
     try:
-        data = request.get_json()
+        data = _read_json()
         
         # Kiểm tra các trường bắt buộc
         if not data or 'plaintext' not in data or 'key' not in data:
@@ -49,9 +119,28 @@ def encrypt():
                 return jsonify({'error': f'Kiểm tra dữ liệu thất bại: {data_msg}'}), 400
             binary_data = plaintext
         
+        # Giới hạn kích thước trước khi chạy vòng lặp thuật toán
+        limit = MAX_BITS_VERBOSE if verbose else MAX_BITS
+        if len(binary_data) > limit:
+            return jsonify({'error': f'Dữ liệu quá lớn: tối đa {limit} bit'}), 413
+        
         # Thực hiện mã hóa
         cipher = TinyA51(key)
-        result = cipher.encrypt_decrypt(binary_data, verbose=verbose)
+        
+        # Gửi dần từng bước nếu client yêu cầu stream
+        if verbose and data.get('stream', False):
+            return _stream_steps(cipher, binary_data, {
+                'success': True,
+                'plaintext': plaintext,
+                'plaintext_binary': binary_data,
+                'key': key,
+                'input_format': input_format
+            }, 'ciphertext', input_format)
+        
+        if input_format == 'char':
+            result = cipher.encrypt_decrypt_char_bits(binary_data, verbose=verbose)
+        else:
+            result = cipher.encrypt_decrypt(binary_data, verbose=verbose)
         
         # Chuẩn bị phản hồi
         response = {
@@ -63,12 +152,9 @@ def encrypt():
             'input_format': input_format
         }
         
-        # Thêm biểu diễn ký tự nếu có thể
+        # Thêm biểu diễn ký tự
         if input_format == 'char':
-            try:
-                response['ciphertext_char'] = binary_to_char(result['result'])
-            except ValueError:
-                response['ciphertext_char'] = None
+            response['ciphertext_char'] = result['result_char']
         
         # Thêm thông tin từng bước nếu được yêu cầu
         if verbose:
@@ -82,11 +168,11 @@ def encrypt():
         return jsonify({'error': f'Mã hóa thất bại: {str(e)}'}), 500
 
 
-@app.route('/api/decrypt', methods=['POST'])
+@bp.route('/api/decrypt', methods=['POST'])
 def decrypt():
     """Giải mã ciphertext bằng TinyA5/1."""
     try:
-        data = request.get_json()
+        data = _read_json()
         
         # Kiểm tra các trường bắt buộc
         if not data or 'ciphertext' not in data or 'key' not in data:
@@ -117,9 +203,28 @@ def decrypt():
                 return jsonify({'error': f'Kiểm tra dữ liệu thất bại: {data_msg}'}), 400
             binary_data = ciphertext
         
+        # Giới hạn kích thước trước khi chạy vòng lặp thuật toán
+        limit = MAX_BITS_VERBOSE if verbose else MAX_BITS
+        if len(binary_data) > limit:
+            return jsonify({'error': f'Dữ liệu quá lớn: tối đa {limit} bit'}), 413
+        
         # Thực hiện giải mã (giống như mã hóa với stream cipher)
         cipher = TinyA51(key)
-        result = cipher.encrypt_decrypt(binary_data, verbose=verbose)
+        
+        # Gửi dần từng bước nếu client yêu cầu stream
+        if verbose and data.get('stream', False):
+            return _stream_steps(cipher, binary_data, {
+                'success': True,
+                'ciphertext': ciphertext,
+                'ciphertext_binary': binary_data,
+                'key': key,
+                'input_format': input_format
+            }, 'plaintext', input_format)
+        
+        if input_format == 'char':
+            result = cipher.encrypt_decrypt_char_bits(binary_data, verbose=verbose)
+        else:
+            result = cipher.encrypt_decrypt(binary_data, verbose=verbose)
         
         # Chuẩn bị phản hồi
         response = {
@@ -131,12 +236,9 @@ def decrypt():
             'input_format': input_format
         }
         
-        # Thêm biểu diễn ký tự nếu có thể
+        # Thêm biểu diễn ký tự
         if input_format == 'char':
-            try:
-                response['plaintext_char'] = binary_to_char(result['result'])
-            except ValueError:
-                response['plaintext_char'] = None
+            response['plaintext_char'] = result['result_char']
         
         # Thêm thông tin từng bước nếu được yêu cầu
         if verbose:
@@ -150,11 +252,11 @@ def decrypt():
         return jsonify({'error': f'Giải mã thất bại: {str(e)}'}), 500
 
 
-@app.route('/api/validate', methods=['POST'])
+@bp.route('/api/validate', methods=['POST'])
 def validate():
     """Kiểm tra dữ liệu đầu vào mà không xử lý."""
     try:
-        data = request.get_json()
+        data = _read_json()
         
         if not data:
             return jsonify({'error': 'Không có dữ liệu được cung cấp'}), 400
@@ -163,6 +265,10 @@ def validate():
         input_data = data.get('data', '')
         input_format = data.get('input_format', 'binary')
         
+        # Không có gì để kiểm tra
+        if not key and not input_data:
+            return jsonify({'valid': True, 'errors': []})
+        
         result = {'valid': True, 'errors': []}
         
         # Kiểm tra khóa
@@ -191,11 +297,11 @@ def validate():
         return jsonify({'error': f'Kiểm tra thất bại: {str(e)}'}), 500
 
 
-@app.route('/api/convert', methods=['POST'])
+@bp.route('/api/convert', methods=['POST'])
 def convert():
     """Chuyển đổi giữa định dạng nhị phân và ký tự."""
     try:
-        data = request.get_json()
+        data = _read_json()
         
         if not data or 'text' not in data or 'from_format' not in data:
             return jsonify({'error': 'Thiếu các trường bắt buộc: text, from_format'}), 400
@@ -236,19 +342,30 @@ def convert():
         return jsonify({'error': f'Chuyển đổi thất bại: {str(e)}'}), 500
 
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(error):
     """Xử lý lỗi 404."""
     return jsonify({'error': 'Không tìm thấy endpoint'}), 404
 
 
-@app.errorhandler(500)
+@bp.app_errorhandler(413)
+def too_large(error):
+    """Xử lý lỗi 413."""
+    return jsonify({'error': 'Dữ liệu gửi lên quá lớn'}), 413
+
+
+@bp.app_errorhandler(500)
 def internal_error(error):
     """Xử lý lỗi 500."""
     return jsonify({'error': 'Lỗi máy chủ nội bộ'}), 500
 
 
+# Ứng dụng cấp mô-đun để `gunicorn app:app` vẫn chạy được (lệnh khởi động cũ)
+app = create_app()
+
+
 if __name__ == '__main__':
+    # Máy chủ phát triển; khi triển khai dùng gunicorn với wsgi.py
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     print("Đang khởi động TinyA5/1 Web Visualizer...")
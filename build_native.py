@@ -0,0 +1,33 @@
+"""
+Biên dịch phần mở rộng C tùy chọn cho TinyA5/1 bằng cffi.
+
+Chạy: python build_native.py
+Kết quả là mô-đun _tinya51_native nằm cạnh tinya51.py; nếu không có mô-đun này,
+tinya51.py tự dùng bản Python/Numba.
+
+Mặc định chỉ dùng -O3 để mô-đun chạy được trên mọi máy cùng kiến trúc. Khi chỉ chạy
+trên máy dựng, có thể thêm cờ qua biến môi trường CFLAGS:
+    CFLAGS="-march=native" python build_native.py
+"""
+
+import os
+import shutil
+
+from cffi import FFI
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+ffibuilder = FFI()
+ffibuilder.cdef("""
+    void ks_xor(uint32_t *px, uint32_t *py, uint32_t *pz,
+                const uint8_t *in, uint8_t *out, size_t n);
+""")
+
+with open(os.path.join(ROOT, 'src', 'tinya51_native.c'), encoding='utf-8') as f:
+    ffibuilder.set_source('_tinya51_native', f.read(), extra_compile_args=['-O3'])
+
+
+if __name__ == "__main__":
+    # Biên dịch trong thư mục build/, sau đó chép mô-đun đã dựng ra cạnh tinya51.py
+    built = ffibuilder.compile(tmpdir=os.path.join(ROOT, 'build'), verbose=True)
+    shutil.copy(built, ROOT)
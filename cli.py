@@ -1,50 +1,105 @@
 import argparse
+import re
 import sys
 from tinya51 import TinyA51, char_to_binary, binary_to_char, validate_key, validate_binary_data, validate_char_data
+from tinya51 import X_LEN, Y_LEN, Z_LEN
+
+# Chuỗi định dạng cố định cho từng thanh ghi, các bit cách nhau bởi dấu cách
+_FMT_X = ' '.join(['%d'] * X_LEN)
+_FMT_Y = ' '.join(['%d'] * Y_LEN)
+_FMT_Z = ' '.join(['%d'] * Z_LEN)
+
+# Dòng phân cách giữa các bước và phần kết quả
+_BAR = '=' * 50
+
+# Biểu thức chính quy biên dịch sẵn cho đầu vào của chế độ tương tác
+# (độ dài khóa lấy từ độ dài ba thanh ghi)
+_KEY_RE = re.compile(r'[01]{%d}' % (X_LEN + Y_LEN + Z_LEN))
+_BIN_RE = re.compile(r'[01]*')
+_CHAR_RE = re.compile(r'[A-Ha-h]*')
+
+# Thông báo hợp lệ của từng hàm kiểm tra, lấy một lần từ chính hàm đó khi nạp mô-đun
+_VALID_MSG = {
+    validate_key: validate_key('0' * (X_LEN + Y_LEN + Z_LEN))[1],
+    validate_binary_data: validate_binary_data('')[1],
+    validate_char_data: validate_char_data('')[1],
+}
+
+
+def _check_input(regex, validator, value):
+    """
+    Kiểm tra đầu vào bằng biểu thức chính quy; chỉ gọi hàm kiểm tra đầy đủ
+    khi không khớp để lấy thông báo lỗi chi tiết.
+    
+    Returns:
+        tuple: (hợp lệ, thông báo) giống các hàm validate_*
+    """
+    if regex.fullmatch(value):
+        return True, _VALID_MSG[validator]
+    return validator(value)
+
+
+def format_register_state(registers, label=""):
+    """Định dạng trạng thái thanh ghi thành chuỗi (mỗi thanh ghi một dòng)."""
+    return (
+        f"{label}X: {_FMT_X % tuple(registers['X'])}\n"
+        f"{label}Y: {_FMT_Y % tuple(registers['Y'])}\n"
+        f"{label}Z: {_FMT_Z % tuple(registers['Z'])}\n"
+    )
 
 
 def print_register_state(registers, label=""):
     """In trạng thái thanh ghi theo định dạng."""
-    print(f"{label}X: {' '.join(map(str, registers['X']))}")
-    print(f"{label}Y: {' '.join(map(str, registers['Y']))}")
-    print(f"{label}Z: {' '.join(map(str, registers['Z']))}")
+    sys.stdout.write(format_register_state(registers, label))
+
+
+def format_step(step, step_num):
+    """Định dạng thông tin chi tiết một bước thành chuỗi."""
+    parts = [
+        f"\n{_BAR}\n",
+        f"BƯỚC {step_num}\n",
+        f"{_BAR}\n",
+        
+        f"Bit điều khiển: x1={step['x1']}, y3={step['y3']}, z3={step['z3']}\n",
+        f"Hàm đa số: maj({step['x1']}, {step['y3']}, {step['z3']}) = {step['majority']}\n",
+        
+        "\nXoay thanh ghi:\n",
+        f"  Xoay X: {step['rotate_X']}\n",
+        f"  Xoay Y: {step['rotate_Y']}\n",
+        f"  Xoay Z: {step['rotate_Z']}\n",
+        
+        "\nTrạng thái thanh ghi:\n",
+        "  Trước khi xoay:\n",
+        format_register_state({
+            'X': step['X_before'],
+            'Y': step['Y_before'],
+            'Z': step['Z_before']
+        }, "    "),
+        "  Sau khi xoay:\n",
+        format_register_state({
+            'X': step['X_after'],
+            'Y': step['Y_after'],
+            'Z': step['Z_after']
+        }, "    "),
+        
+        "\nTạo keystream:\n",
+        f"  s = x5 XOR y7 XOR z8 = {step['X_after'][5]} XOR {step['Y_after'][7]} XOR {step['Z_after'][8]} = {step['keystream_bit']}\n",
+        
+        "\nMã hóa:\n",
+        f"  Bit dữ liệu: {step['data_bit']}\n",
+        f"  Bit mã: {step['data_bit']} XOR {step['keystream_bit']} = {step['cipher_bit']}\n",
+    ]
+    return ''.join(parts)
 
 
 def print_step(step, step_num):
-    """In thông tin chi tiết từng bước."""
-    print(f"\n{'='*50}")
-    print(f"BƯỚC {step_num}")
-    print(f"{'='*50}")
-    
-    print(f"Bit điều khiển: x1={step['x1']}, y3={step['y3']}, z3={step['z3']}")
-    print(f"Hàm đa số: maj({step['x1']}, {step['y3']}, {step['z3']}) = {step['majority']}")
-    
-    print(f"\nXoay thanh ghi:")
-    print(f"  Xoay X: {step['rotate_X']}")
-    print(f"  Xoay Y: {step['rotate_Y']}")
-    print(f"  Xoay Z: {step['rotate_Z']}")
-    
-    print(f"\nTrạng thái thanh ghi:")
-    print("  Trước khi xoay:")
-    print_register_state({
-        'X': step['X_before'],
-        'Y': step['Y_before'],
-        'Z': step['Z_before']
-    }, "    ")
-    
-    print("  Sau khi xoay:")
-    print_register_state({
-        'X': step['X_after'],
-        'Y': step['Y_after'],
-        'Z': step['Z_after']
-    }, "    ")
-    
-    print(f"\nTạo keystream:")
-    print(f"  s = x5 XOR y7 XOR z8 = {step['X_after'][5]} XOR {step['Y_after'][7]} XOR {step['Z_after'][8]} = {step['keystream_bit']}")
-    
-    print(f"\nMã hóa:")
-    print(f"  Bit dữ liệu: {step['data_bit']}")
-    print(f"  Bit mã: {step['data_bit']} XOR {step['keystream_bit']} = {step['cipher_bit']}")
+    """In thông tin chi tiết từng bước (ghi ra stdout một lần cho cả bước)."""
+    sys.stdout.write(format_step(step, step_num))
+
+
+def print_steps(steps):
+    """In tất cả các bước bằng một lần ghi ra stdout thay vì một lần cho mỗi bước."""
+    sys.stdout.write(''.join([format_step(step, i) for i, step in enumerate(steps)]))
 
 
 def interactive_mode():
@@ -89,15 +144,15 @@ def interactive_mode():
         key = input("Nhập khóa 23 bit: ").strip()
         
         # Validate inputs
-        valid_key, key_msg = validate_key(key)
+        valid_key, key_msg = _check_input(_KEY_RE, validate_key, key)
         if not valid_key:
             print(f"Lỗi khóa: {key_msg}")
             continue
         
         if is_binary:
-            valid_data, data_msg = validate_binary_data(data)
+            valid_data, data_msg = _check_input(_BIN_RE, validate_binary_data, data)
         else:
-            valid_data, data_msg = validate_char_data(data)
+            valid_data, data_msg = _check_input(_CHAR_RE, validate_char_data, data)
         
         if not valid_data:
             print(f"Lỗi dữ liệu: {data_msg}")
@@ -137,12 +192,11 @@ def interactive_mode():
                     else:
                         print_register_state(cipher.get_register_state())
                     
-                    for i, step in enumerate(result['steps']):
-                        print_step(step, i)
+                    print_steps(result['steps'])
                     
-                    print(f"\n{'='*50}")
+                    print(f"\n{_BAR}")
                     print("KẾT QUẢ CUỐI CÙNG")
-                    print(f"{'='*50}")
+                    print(_BAR)
                 
                 print(f"Plaintext: {data}")
                 if not is_binary:
@@ -166,12 +220,11 @@ def interactive_mode():
                     else:
                         print_register_state(cipher.get_register_state())
                     
-                    for i, step in enumerate(result['steps']):
-                        print_step(step, i)
+                    print_steps(result['steps'])
                     
-                    print(f"\n{'='*50}")
+                    print(f"\n{_BAR}")
                     print("KẾT QUẢ CUỐI CÙNG")
-                    print(f"{'='*50}")
+                    print(_BAR)
                 
                 print(f"Ciphertext: {data}")
                 if not is_binary:
@@ -190,6 +243,11 @@ def interactive_mode():
 
 def main():
     """Hàm CLI chính."""
+    # Chỉ có --interactive: vào thẳng chế độ tương tác, không cần dựng trình phân tích đối số
+    if sys.argv[1:] in (['-i'], ['--interactive']):
+        interactive_mode()
+        return
+    
     parser = argparse.ArgumentParser(
         description="Công Cụ Dòng Lệnh TinyA5/1 Stream Cipher",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -274,12 +332,11 @@ Ví dụ:
             else:
                 print_register_state(cipher.get_register_state())
             
-            for i, step in enumerate(result['steps']):
-                print_step(step, i)
+            print_steps(result['steps'])
             
-            print(f"\n{'='*50}")
+            print(f"\n{_BAR}")
             print("KẾT QUẢ CUỐI CÙNG")
-            print(f"{'='*50}")
+            print(_BAR)
         
         if args.encrypt:
             print(f"Plaintext: {args.data}")
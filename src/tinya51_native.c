@@ -0,0 +1,60 @@
+/*
+ * Vòng lặp keystream TinyA5/1 viết bằng C (tùy chọn, biên dịch bằng build_native.py).
+ *
+ * Thanh ghi được đóng gói giống tinya51.py: bit i của số nguyên là phần tử i
+ * của danh sách (x0 là bit thấp nhất). Dữ liệu vào/ra là các byte ASCII '0'/'1'.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+#define X_MASK 0x3Fu
+#define Y_MASK 0xFFu
+#define Z_MASK 0x1FFu
+
+#define X_TAPMASK ((1u << 2) | (1u << 4) | (1u << 5))
+#define Y_TAPMASK ((1u << 6) | (1u << 7))
+#define Z_TAPMASK ((1u << 2) | (1u << 7) | (1u << 8))
+
+#if defined(__GNUC__) || defined(__clang__)
+#define PARITY(v) ((uint32_t)__builtin_parity(v))
+#else
+static uint32_t parity_fallback(uint32_t v)
+{
+    v ^= v >> 16;
+    v ^= v >> 8;
+    v ^= v >> 4;
+    v ^= v >> 2;
+    v ^= v >> 1;
+    return v & 1u;
+}
+#define PARITY(v) parity_fallback(v)
+#endif
+
+void ks_xor(uint32_t *px, uint32_t *py, uint32_t *pz,
+            const uint8_t *in, uint8_t *out, size_t n)
+{
+    uint32_t x = *px, y = *py, z = *pz;
+
+    for (size_t i = 0; i < n; i++) {
+        /* Bit điều khiển x1, y3, z3 và hàm đa số */
+        uint32_t cx = (x >> 1) & 1u;
+        uint32_t cy = (y >> 3) & 1u;
+        uint32_t cz = (z >> 3) & 1u;
+        uint32_t m = (cx & cy) | (cx & cz) | (cy & cz);
+
+        /* Luôn tính trạng thái sau khi xoay, chọn bằng mặt nạ thay cho rẽ nhánh */
+        uint32_t nx = ((x << 1) | PARITY(x & X_TAPMASK)) & X_MASK;
+        uint32_t ny = ((y << 1) | PARITY(y & Y_TAPMASK)) & Y_MASK;
+        uint32_t nz = ((z << 1) | PARITY(z & Z_TAPMASK)) & Z_MASK;
+        x = nx ^ ((nx ^ x) & (0u - (cx ^ m)));
+        y = ny ^ ((ny ^ y) & (0u - (cy ^ m)));
+        z = nz ^ ((nz ^ z) & (0u - (cz ^ m)));
+
+        /* s = x5 ⊕ y7 ⊕ z8 */
+        out[i] = in[i] ^ (uint8_t)(((x >> 5) ^ (y >> 7) ^ (z >> 8)) & 1u);
+    }
+
+    *px = x;
+    *py = y;
+    *pz = z;
+}
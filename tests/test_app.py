@@ -0,0 +1,96 @@
+"""
+Kiểm tra các endpoint API của ứng dụng Flask bằng test_client().
+
+Chạy: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import MAX_BITS, MAX_BITS_VERBOSE, MAX_CONTENT_LENGTH, create_app
+from test_tinya51 import KEY, STEPS_111
+
+
+class StreamTest(unittest.TestCase):
+    """Chế độ stream: dòng đầu, mỗi bước một dòng và dòng kết quả cuối."""
+
+    def setUp(self):
+        self.client = create_app().test_client()
+
+    def post_lines(self, path, body):
+        response = self.client.post(path, json=body)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [orjson.loads(line) for line in response.get_data().splitlines()]
+
+    def test_encrypt_binary(self):
+        lines = self.post_lines('/api/encrypt', {
+            'plaintext': '111', 'key': KEY, 'verbose': True, 'stream': True})
+        self.assertEqual(len(lines), 5)
+        header, steps, trailer = lines[0], lines[1:-1], lines[-1]
+        self.assertEqual(header['plaintext_binary'], '111')
+        self.assertEqual(header['initial_state'], {'X': STEPS_111[0]['X_before'],
+                                                   'Y': STEPS_111[0]['Y_before'],
+                                                   'Z': STEPS_111[0]['Z_before']})
+        self.assertEqual(steps, STEPS_111)
+        self.assertEqual(trailer, {'ciphertext': '011'})
+
+    def test_decrypt_char(self):
+        lines = self.post_lines('/api/decrypt', {
+            'ciphertext': 'D', 'key': KEY, 'input_format': 'char', 'verbose': True, 'stream': True})
+        self.assertEqual(lines[0]['ciphertext_binary'], '011')
+        self.assertEqual(len(lines[1:-1]), 3)
+        self.assertEqual(lines[-1], {'plaintext': '111', 'plaintext_char': 'H'})
+
+
+class LimitTest(unittest.TestCase):
+    """Giới hạn kích thước (413) và các kiểm tra đầu vào ở biên API."""
+
+    def setUp(self):
+        self.client = create_app().test_client()
+
+    def test_body_too_large(self):
+        body = b'{"plaintext": "' + b'1' * MAX_CONTENT_LENGTH + b'", "key": "' + KEY.encode() + b'"}'
+        response = self.client.post('/api/encrypt', data=body, content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json(), {'error': 'Dữ liệu gửi lên quá lớn'})
+
+    def test_too_many_bits(self):
+        # Dữ liệu ký tự: mỗi ký tự thành 3 bit nên vượt MAX_BITS mà thân request vẫn dưới 1 MB
+        response = self.client.post('/api/encrypt', json={
+            'plaintext': 'H' * (MAX_BITS // 3 + 1), 'key': KEY, 'input_format': 'char'})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json(), {'error': f'Dữ liệu quá lớn: tối đa {MAX_BITS} bit'})
+
+        response = self.client.post('/api/encrypt', json={
+            'plaintext': 'H' * (MAX_BITS // 3), 'key': KEY, 'input_format': 'char'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_too_many_verbose_bits(self):
+        response = self.client.post('/api/decrypt', json={
+            'ciphertext': '1' * (MAX_BITS_VERBOSE + 1), 'key': KEY, 'verbose': True})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json(), {'error': f'Dữ liệu quá lớn: tối đa {MAX_BITS_VERBOSE} bit'})
+
+        response = self.client.post('/api/decrypt', json={
+            'ciphertext': '1' * MAX_BITS_VERBOSE, 'key': KEY, 'verbose': True})
+        self.assertEqual(response.status_code, 200)
+
+    def test_validate_empty(self):
+        response = self.client.post('/api/validate', json={'key': '', 'data': ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'valid': True, 'errors': []})
+
+    def test_non_string_key(self):
+        for key in ([1] * 23, {'a': 1}):
+            response = self.client.post('/api/encrypt', json={'plaintext': '111', 'key': key})
+            self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Kiểm tra đáp án đã biết cho mọi đường chạy của TinyA5/1.
+
+Mỗi đường chạy (C, Numba, Python thuần, chi tiết, mảng NumPy, cắt lát bit) được
+ép dùng riêng và so với cùng một đáp án, để đường nào lệch cũng bị phát hiện
+dù bình thường bị đường khác che mất.
+
+Chạy: python -m unittest discover tests
+"""
+
+import hashlib
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tinya51
+from tinya51 import TinyA51, TinyA51Bitsliced
+
+
+KEY = '10010101001110100110000'
+KEY2 = '01110010110100101011101'
+
+# Ví dụ trong README: "111" -> "011"
+STEPS_111 = [
+    {'x1': 0, 'y3': 0, 'z3': 1, 'majority': 0,
+     'rotate_X': True, 'rotate_Y': True, 'rotate_Z': False,
+     'X_before': [1, 0, 0, 1, 0, 1], 'Y_before': [0, 1, 0, 0, 1, 1, 1, 0], 'Z_before': [1, 0, 0, 1, 1, 0, 0, 0, 0],
+     'X_after': [1, 1, 0, 0, 1, 0], 'Y_after': [1, 0, 1, 0, 0, 1, 1, 1], 'Z_after': [1, 0, 0, 1, 1, 0, 0, 0, 0],
+     'keystream_bit': 1, 'data_bit': 1, 'cipher_bit': 0, 'step': 0},
+    {'x1': 1, 'y3': 0, 'z3': 1, 'majority': 1,
+     'rotate_X': True, 'rotate_Y': False, 'rotate_Z': True,
+     'X_before': [1, 1, 0, 0, 1, 0], 'Y_before': [1, 0, 1, 0, 0, 1, 1, 1], 'Z_before': [1, 0, 0, 1, 1, 0, 0, 0, 0],
+     'X_after': [1, 1, 1, 0, 0, 1], 'Y_after': [1, 0, 1, 0, 0, 1, 1, 1], 'Z_after': [0, 1, 0, 0, 1, 1, 0, 0, 0],
+     'keystream_bit': 0, 'data_bit': 1, 'cipher_bit': 1, 'step': 1},
+    {'x1': 1, 'y3': 0, 'z3': 0, 'majority': 0,
+     'rotate_X': False, 'rotate_Y': True, 'rotate_Z': True,
+     'X_before': [1, 1, 1, 0, 0, 1], 'Y_before': [1, 0, 1, 0, 0, 1, 1, 1], 'Z_before': [0, 1, 0, 0, 1, 1, 0, 0, 0],
+     'X_after': [1, 1, 1, 0, 0, 1], 'Y_after': [0, 1, 0, 1, 0, 0, 1, 1], 'Z_after': [0, 0, 1, 0, 0, 1, 1, 0, 0],
+     'keystream_bit': 0, 'data_bit': 1, 'cipher_bit': 1, 'step': 2},
+]
+
+# Dữ liệu dài hơn NUMBA_MIN_BITS: đáp án lưu dưới dạng SHA-256 của chuỗi kết quả và trạng thái cuối
+LONG_DATA = '1101000110' * 205
+LONG_ANSWERS = {
+    KEY: (
+        'c4b66f2ff3b7770e833bc65c0cb435e49a704212a736a7fdf474e204803f137f',
+        {'X': [1, 0, 0, 1, 0, 1], 'Y': [0, 0, 1, 1, 1, 0, 1, 0], 'Z': [0, 0, 0, 1, 0, 1, 1, 1, 1]},
+    ),
+    KEY2: (
+        'bb577aaae1680ae4c16ff97e9ba299822fab96f02030f901f2eb9ee59f793d23',
+        {'X': [0, 1, 1, 1, 0, 0], 'Y': [1, 1, 1, 0, 0, 0, 0, 0], 'Z': [1, 0, 1, 0, 0, 0, 0, 0, 1]},
+    ),
+}
+SHORT_ANSWERS = [
+    (KEY, '111', '011'),
+    (KEY2, '0000000000000000', '1110110101100101'),
+    (KEY, '', ''),
+]
+
+
+def _digest(result):
+    return hashlib.sha256(result.encode('ascii')).hexdigest()
+
+
+class FastPathTest(unittest.TestCase):
+    """Đường chạy không chi tiết: ép lần lượt C, Numba và Python thuần."""
+
+    def check_answers(self):
+        for key, data, expected in SHORT_ANSWERS:
+            self.assertEqual(TinyA51(key).encrypt_decrypt(data)['result'], expected)
+
+        for key, (digest, state) in LONG_ANSWERS.items():
+            cipher = TinyA51(key)
+            result = cipher.encrypt_decrypt(LONG_DATA)['result']
+            self.assertEqual(_digest(result), digest)
+            self.assertEqual(cipher.get_register_state(), state)
+            # Giải mã lại phải ra bản rõ
+            self.assertEqual(TinyA51(key).encrypt_decrypt(result)['result'], LONG_DATA)
+
+    def test_native(self):
+        if tinya51._native_lib is None:
+            self.skipTest("chưa dựng phần mở rộng C (python build_native.py)")
+        self.check_answers()
+
+    def test_numba(self):
+        with mock.patch.object(tinya51, '_native_lib', None), \
+                mock.patch.object(tinya51, '_numba_kernel', None):
+            tinya51.warm_up()
+            if tinya51._numba_kernel is None:
+                self.skipTest("chưa cài Numba")
+            self.check_answers()
+
+    def test_pure_python(self):
+        with mock.patch.object(tinya51, '_native_lib', None), \
+                mock.patch.object(tinya51, '_numba_kernel', None):
+            self.check_answers()
+
+
+class VerboseTest(unittest.TestCase):
+    """Đường chạy chi tiết: từ điển bước và luồng bước."""
+
+    def test_steps(self):
+        result = TinyA51(KEY).encrypt_decrypt('111', verbose=True)
+        self.assertEqual(result['result'], '011')
+        self.assertEqual(result['steps'], STEPS_111)
+        self.assertEqual({k: list(v) for k, v in result['initial_state'].items()},
+                         {'X': STEPS_111[0]['X_before'],
+                          'Y': STEPS_111[0]['Y_before'],
+                          'Z': STEPS_111[0]['Z_before']})
+
+    def test_iter_steps(self):
+        self.assertEqual(list(TinyA51(KEY).iter_steps('111')), STEPS_111)
+
+    def test_char_bits(self):
+        result = TinyA51(KEY).encrypt_decrypt_char_bits('111', verbose=True)
+        self.assertEqual(result['steps'], STEPS_111)
+        self.assertEqual(result['result_char'], 'D')
+
+    def test_long_verbose_matches_fast(self):
+        cipher = TinyA51(KEY2)
+        result = cipher.encrypt_decrypt(LONG_DATA, verbose=True)
+        digest, state = LONG_ANSWERS[KEY2]
+        self.assertEqual(_digest(result['result']), digest)
+        self.assertEqual(cipher.get_register_state(), state)
+
+
+class BitslicedTest(unittest.TestCase):
+    """TinyA51Bitsliced: mỗi luồng phải cho cùng kết quả với TinyA51 một khóa."""
+
+    def test_answers(self):
+        keys = [key for key, _, _ in SHORT_ANSWERS] + list(LONG_ANSWERS)
+        messages = [data for _, data, _ in SHORT_ANSWERS] + [LONG_DATA] * len(LONG_ANSWERS)
+        results = TinyA51Bitsliced(keys).encrypt_decrypt(messages)
+
+        self.assertEqual(results[:len(SHORT_ANSWERS)], [expected for _, _, expected in SHORT_ANSWERS])
+        self.assertEqual([_digest(r) for r in results[len(SHORT_ANSWERS):]],
+                         [digest for digest, _ in LONG_ANSWERS.values()])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TinyA51Bitsliced([KEY, '101'])
+        with self.assertRaises(ValueError):
+            TinyA51Bitsliced([KEY]).encrypt_decrypt(['012'])
+        with self.assertRaises(ValueError):
+            TinyA51Bitsliced([KEY, KEY2]).encrypt_decrypt(['01'])
+
+
+if __name__ == '__main__':
+    unittest.main()
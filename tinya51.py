@@ -9,7 +9,153 @@ Mô-đun này hiện thực thuật toán TinyA5/1 với:
 - Theo dõi thực thi từng bước để trực quan hóa
 """
 
+from functools import lru_cache
+
+# NumPy và Numba là tùy chọn và chỉ được nạp khi cần (xem _load_numba_kernel):
+# nạp sẵn khi import làm mỗi lần chạy CLI chậm thêm khoảng 0.3 giây
+np = None
+
+try:
+    from _tinya51_native import ffi as _native_ffi, lib as _native_lib
+except ImportError:  # Phần mở rộng C là tùy chọn (dựng bằng build_native.py)
+    _native_ffi = _native_lib = None
+
+# Độ dài và mặt nạ của các thanh ghi, mỗi thanh ghi đóng gói thành một số nguyên
+# (bit i của số nguyên là phần tử i của thanh ghi: x0 là bit thấp nhất)
+X_LEN, Y_LEN, Z_LEN = 6, 8, 9
+X_MASK = (1 << X_LEN) - 1
+Y_MASK = (1 << Y_LEN) - 1
+Z_MASK = (1 << Z_LEN) - 1
+
+# Vị trí bit điều khiển (x1, y3, z3), điểm hồi tiếp và bit đầu ra (x5, y7, z8), chỉ số theo 0
+X_CLOCK, Y_CLOCK, Z_CLOCK = 1, 3, 3
+X_TAPS, Y_TAPS, Z_TAPS = (2, 4, 5), (6, 7), (2, 7, 8)
+X_OUT, Y_OUT, Z_OUT = X_LEN - 1, Y_LEN - 1, Z_LEN - 1
+
+# Mặt nạ điểm hồi tiếp: bit hồi tiếp t là tính chẵn lẻ của (r & TAPMASK)
+X_TAPMASK = sum(1 << i for i in X_TAPS)
+Y_TAPMASK = sum(1 << i for i in Y_TAPS)
+Z_TAPMASK = sum(1 << i for i in Z_TAPS)
+
+# Bảng tính chẵn lẻ cho mọi giá trị thanh ghi (đủ cho thanh ghi dài nhất)
+_PARITY = bytes(bin(i).count('1') & 1 for i in range(1 << Z_LEN))
+
+# Bảng trạng thái sau một lần xoay cho mọi giá trị thanh ghi (64/256/512 phần tử):
+# phép xoay ((r << 1) | t) & mask chỉ còn là một lần tra bảng _ROT_X[r]
+_ROT_X = tuple(((v << 1) | _PARITY[v & X_TAPMASK]) & X_MASK for v in range(1 << X_LEN))
+_ROT_Y = tuple(((v << 1) | _PARITY[v & Y_TAPMASK]) & Y_MASK for v in range(1 << Y_LEN))
+_ROT_Z = tuple(((v << 1) | _PARITY[v & Z_TAPMASK]) & Z_MASK for v in range(1 << Z_LEN))
+
+# Bảng xóa ký tự hợp lệ cho str.translate: chuỗi còn lại khác rỗng nghĩa là có ký tự không hợp lệ
+_BIN_DEL = str.maketrans('', '', '01')
+_CHAR_DEL = str.maketrans('', '', 'ABCDEFGHabcdefgh')
+
+
+def _not_binary(text):
+    """
+    Trả về True nếu chuỗi có ký tự khác '0'/'1'.
+    
+    Kiểm tra trên bytes: bytes.translate xóa '0'/'1' nhanh hơn str.translate với dữ liệu dài.
+    Ký tự ngoài ASCII được thay bằng '?' khi mã hóa nên vẫn bị coi là không hợp lệ.
+    """
+    return bool(text.encode('ascii', 'replace').translate(None, b'01'))
+
+
+def _unpack(value, length):
+    """Tách số nguyên thành danh sách bit (phần tử 0 là bit thấp nhất)."""
+    return [(value >> i) & 1 for i in range(length)]
+
+
+# Bảng bit của mọi giá trị thanh ghi: thông tin bước chỉ cần giữ số nguyên đóng gói,
+# danh sách bit được dựng khi cần bằng list(_BITS_X[x]) thay vì tách lại từng bit
+_BITS_X = tuple(tuple(_unpack(v, X_LEN)) for v in range(1 << X_LEN))
+_BITS_Y = tuple(tuple(_unpack(v, Y_LEN)) for v in range(1 << Y_LEN))
+_BITS_Z = tuple(tuple(_unpack(v, Z_LEN)) for v in range(1 << Z_LEN))
+
+
+@lru_cache(maxsize=1024)
+def _parse_key(key):
+    """
+    Kiểm tra khóa 23 bit và tách thành trạng thái ban đầu (x0, y0, z0) dạng số nguyên.
+    
+    Kết quả được lưu đệm theo khóa nên tạo lại TinyA51 với cùng khóa chỉ còn một lần tra từ điển.
+    """
+    if len(key) != 23:
+        raise ValueError("Khóa phải dài chính xác 23 bit")
+    if _not_binary(key):
+        raise ValueError("Khóa chỉ được chứa các ký tự 0 và 1")
+    
+    # Chia khóa 23 bit vào các thanh ghi X: 6 bit, Y: 8 bit, Z: 9 bit.
+    # Ký tự đầu của mỗi đoạn là x0/y0/z0 (bit thấp nhất) nên đảo chuỗi trước khi đổi sang số
+    return int(key[:6][::-1], 2), int(key[6:14][::-1], 2), int(key[14:23][::-1], 2)
+
+
+# Độ dài dữ liệu tối thiểu để dùng bản biên dịch Numba (ngắn hơn thì vòng lặp Python đủ nhanh)
+NUMBA_MIN_BITS = 1024
+
+# Bảng chẵn lẻ dạng mảng cho bản Numba, tạo khi biên dịch
+_PARITY_ARRAY = None
+
+# Bản Numba đã biên dịch, chỉ được gán trong warm_up(): nạp Numba ngay trong một request
+# tốn khoảng 0.4 giây, lâu hơn cả vòng lặp Python với dữ liệu dài nhất cho phép
+_numba_kernel = None
+
+
+def _keystream_xor_py(x, y, z, data):
+    """
+    Vòng lặp keystream cho Numba: XOR từng byte ASCII '0'/'1' với bit keystream.
+    
+    Chỉ chạy qua bản biên dịch do _load_numba_kernel() tạo ra.
+    
+    Returns:
+        tuple: (mảng kết quả uint8, x, y, z cuối)
+    """
+    # Cố định kiểu int64 có dấu cho trạng thái: mặt nạ -(c ^ m) bên dưới cần số có dấu,
+    # và Numba không phải suy kiểu khác nhau tùy giá trị truyền vào
+    x, y, z = np.int64(x), np.int64(y), np.int64(z)
+    out = np.empty(data.size, dtype=np.uint8)
+    for i in range(data.size):
+        cx = (x >> X_CLOCK) & 1
+        cy = (y >> Y_CLOCK) & 1
+        cz = (z >> Z_CLOCK) & 1
+        m = (cx & cy) | (cx & cz) | (cy & cz)
+        
+        # Luôn tính trạng thái sau khi xoay rồi chọn bằng mặt nạ thay cho rẽ nhánh:
+        # cx == m cho mặt nạ 0 (giữ nx), ngược lại mặt nạ -1 (trả về x)
+        nx = ((x << 1) | _PARITY_ARRAY[x & X_TAPMASK]) & X_MASK
+        ny = ((y << 1) | _PARITY_ARRAY[y & Y_TAPMASK]) & Y_MASK
+        nz = ((z << 1) | _PARITY_ARRAY[z & Z_TAPMASK]) & Z_MASK
+        x = nx ^ ((nx ^ x) & -(cx ^ m))
+        y = ny ^ ((ny ^ y) & -(cy ^ m))
+        z = nz ^ ((nz ^ z) & -(cz ^ m))
+        
+        out[i] = data[i] ^ (((x >> X_OUT) ^ (y >> Y_OUT) ^ (z >> Z_OUT)) & 1)
+    return out, x, y, z
+
+
+@lru_cache(maxsize=None)
+def _load_numba_kernel():
+    """
+    Nạp Numba và bọc _keystream_xor_py bằng njit lần đầu cần đến.
+    
+    Returns:
+        Hàm đã bọc (biên dịch khi gọi lần đầu), hoặc None nếu thiếu NumPy/Numba
+    """
+    global np, _PARITY_ARRAY
+    try:
+        import numpy
+        from numba import njit
+    except ImportError:
+        return None
+    
+    np = numpy
+    _PARITY_ARRAY = np.frombuffer(_PARITY, dtype=np.uint8)
+    return njit(cache=True, boundscheck=False)(_keystream_xor_py)
+
+
 class TinyA51:
+    __slots__ = ('key', 'x', 'y', 'z', '_x0', '_y0', '_z0', '_initial_state')
+    
     def __init__(self, key):
         """
         Khởi tạo TinyA5/1 với khóa 23 bit.
@@ -17,26 +163,26 @@ class TinyA51:
         Args:
             key (str): Chuỗi nhị phân 23 bit
         """
-        if len(key) != 23:
-            raise ValueError("Khóa phải dài chính xác 23 bit")
-        if not all(c in '01' for c in key):
-            raise ValueError("Khóa chỉ được chứa các ký tự 0 và 1")
-        
         self.key = key
+        self._x0, self._y0, self._z0 = _parse_key(key)
+        self._snapshot_initial_state()
         self.reset()
     
+    def _snapshot_initial_state(self):
+        """Lưu trạng thái ban đầu một lần dưới dạng tuple bất biến để dùng lại cho mọi lần chạy chi tiết."""
+        self._initial_state = {
+            'X': _BITS_X[self._x0],
+            'Y': _BITS_Y[self._y0],
+            'Z': _BITS_Z[self._z0]
+        }
+    
+    def get_initial_state(self):
+        """Lấy trạng thái ban đầu (theo khóa) của các thanh ghi."""
+        return self._initial_state
+    
     def reset(self):
         """Đặt lại các thanh ghi về trạng thái ban đầu dựa trên khóa."""
-        # Chia khóa 23 bit vào các thanh ghi
-        # X: 6 bit, Y: 8 bit, Z: 9 bit
-        self.X = list(self.key[:6])    # x0, x1, ..., x5
-        self.Y = list(self.key[6:14])  # y0, y1, ..., y7
-        self.Z = list(self.key[14:23]) # z0, z1, ..., z8
-        
-        # Chuyển thành số nguyên để thao tác dễ hơn
-        self.X = [int(bit) for bit in self.X]
-        self.Y = [int(bit) for bit in self.Y]
-        self.Z = [int(bit) for bit in self.Z]
+        self.x, self.y, self.z = self._x0, self._y0, self._z0
     
     def majority(self, x1, y3, z3):
         """
@@ -48,32 +194,20 @@ class TinyA51:
     
     def rotate_X(self):
         """Xoay thanh ghi X: t = x2 ⊕ x4 ⊕ x5 (chỉ số theo 1: 2,4,5; theo 0: 2,4,5), sau đó dịch phải và đặt x0 = t"""
-        # Theo chỉ số bắt đầu từ 1: x2, x4, x5 = theo 0: 2, 4, 5
-        t = self.X[2] ^ self.X[4] ^ self.X[5]
-        # Dịch phải: x5 = x4, x4 = x3, ..., x1 = x0
-        for i in range(5, 0, -1):
-            self.X[i] = self.X[i-1]
-        self.X[0] = t
+        # Dịch phải (x5 = x4, ..., x1 = x0) là dịch trái số nguyên; t là tính chẵn lẻ của các điểm hồi tiếp.
+        # Kết quả được tính sẵn cho mọi giá trị trong _ROT_X
+        self.x = _ROT_X[self.x]
     
     def rotate_Y(self):
         """Xoay thanh ghi Y: t = y6 ⊕ y7, sau đó dịch phải và đặt y0 = t"""
-        t = self.Y[6] ^ self.Y[7]
-        # Dịch phải: y7 = y6, y6 = y5, ..., y1 = y0
-        for i in range(7, 0, -1):
-            self.Y[i] = self.Y[i-1]
-        self.Y[0] = t
+        self.y = _ROT_Y[self.y]
     
     def rotate_Z(self):
         """
         Xoay thanh ghi Z: t = z2 ⊕ z7 ⊕ z8 (chỉ số theo 1: 2,7,8; theo 0: 2,7,8), sau đó dịch phải và đặt z0 = t
         Lưu ý: Theo tài liệu ATBMTT, các điểm hồi tiếp là z2, z7, z8
         """
-        # Theo chỉ số bắt đầu từ 1: z2, z7, z8 = theo 0: 2, 7, 8
-        t = self.Z[2] ^ self.Z[7] ^ self.Z[8]
-        # Dịch phải: z8 = z7, z7 = z6, ..., z1 = z0
-        for i in range(8, 0, -1):
-            self.Z[i] = self.Z[i-1]
-        self.Z[0] = t
+        self.z = _ROT_Z[self.z]
     
     def generate_bit(self, step_info=None):
         """
@@ -87,7 +221,9 @@ class TinyA51:
         """
         # Lấy các bit điều khiển (chỉ số theo 1: x1, y3, z3 = theo 0: x[1], y[3], z[3])
         # Lưu ý: Trong tài liệu, ký hiệu dùng chỉ số bắt đầu từ 1, còn ở đây dùng mảng bắt đầu từ 0
-        x1, y3, z3 = self.X[1], self.Y[3], self.Z[3]
+        x1 = (self.x >> X_CLOCK) & 1
+        y3 = (self.y >> Y_CLOCK) & 1
+        z3 = (self.z >> Z_CLOCK) & 1
         
         # Tính hàm đa số
         m = self.majority(x1, y3, z3)
@@ -105,9 +241,9 @@ class TinyA51:
                 'rotate_X': rotate_X,
                 'rotate_Y': rotate_Y,
                 'rotate_Z': rotate_Z,
-                'X_before': self.X.copy(),
-                'Y_before': self.Y.copy(),
-                'Z_before': self.Z.copy()
+                'X_before': list(_BITS_X[self.x]),
+                'Y_before': list(_BITS_Y[self.y]),
+                'Z_before': list(_BITS_Z[self.z])
             })
         
         # Xoay các thanh ghi dựa vào hàm đa số
@@ -120,14 +256,14 @@ class TinyA51:
         
         # Sinh bit keystream SAU khi xoay: s = x5 ⊕ y7 ⊕ z8 (chỉ số theo 1) = x[5] ⊕ y[7] ⊕ z[8] (theo 0)
         # Đây là các bit cuối của mỗi thanh ghi sau khi xoay
-        s = self.X[5] ^ self.Y[7] ^ self.Z[8]
+        s = ((self.x >> X_OUT) ^ (self.y >> Y_OUT) ^ (self.z >> Z_OUT)) & 1
         
         # Lưu trạng thái cuối nếu được yêu cầu
         if step_info is not None:
             step_info.update({
-                'X_after': self.X.copy(),
-                'Y_after': self.Y.copy(),
-                'Z_after': self.Z.copy(),
+                'X_after': list(_BITS_X[self.x]),
+                'Y_after': list(_BITS_Y[self.y]),
+                'Z_after': list(_BITS_Z[self.z]),
                 'keystream_bit': s
             })
         
@@ -144,58 +280,340 @@ class TinyA51:
         Returns:
             dict: Kết quả gồm bản mã/bản rõ và chi tiết bước (tùy chọn)
         """
-        if not all(c in '01' for c in data):
+        if _not_binary(data):
             raise ValueError("Dữ liệu chỉ được chứa các ký tự 0 và 1")
         
-        self.reset()
+        # Chọn đường chạy một lần: đường nhanh không tạo thông tin bước nào
+        if not verbose:
+            return {
+                'result': self._encrypt_fast(data),
+                'input': data,
+                'key': self.key
+            }
+        
+        result, steps = self._encrypt_verbose(data)
+        return {
+            'result': result,
+            'input': data,
+            'key': self.key,
+            'steps': steps,
+            'initial_state': self._initial_state
+        }
+    
+    def encrypt_decrypt_char_bits(self, bits, verbose=False):
+        """
+        Mã hóa hoặc giải mã dữ liệu đã chuyển từ ký tự A-H, kèm kết quả dạng ký tự.
+        
+        Dữ liệu lấy từ char_to_binary nên luôn hợp lệ: bỏ qua bước kiểm tra lại
+        và chuyển kết quả sang ký tự mà không cần cắt từng nhóm 3 bit.
         
-        # Ghi lại trạng thái ban đầu cho chế độ chi tiết
-        initial_state = None
+        Args:
+            bits (str): Chuỗi nhị phân từ char_to_binary
+            verbose (bool): Nếu True, trả về thông tin chi tiết từng bước
+            
+        Returns:
+            dict: Giống encrypt_decrypt, thêm 'result_char'
+        """
         if verbose:
-            initial_state = {
-                'X': self.X.copy(),
-                'Y': self.Y.copy(),
-                'Z': self.Z.copy()
+            cipher_bits, steps = self._encrypt_verbose(bits)
+            result = {
+                'result': cipher_bits,
+                'input': bits,
+                'key': self.key,
+                'steps': steps,
+                'initial_state': self._initial_state
+            }
+        else:
+            result = {
+                'result': self._encrypt_fast(bits),
+                'input': bits,
+                'key': self.key
             }
         
-        result = []
-        steps = []
+        result['result_char'] = _bits_to_chars(result['result'])
+        return result
+    
+    def _encrypt_verbose(self, data):
+        """
+        Mã hóa/giải mã kèm thông tin từng bước (dữ liệu đã được kiểm tra).
+        
+        Returns:
+            tuple: (chuỗi kết quả, danh sách từ điển bước)
+        """
+        self.reset()
+        steps = list(self._generate_steps(data))
+        # Ghi mã ASCII của từng bit mã vào bộ đệm cấp phát sẵn thay vì tạo chuỗi một ký tự
+        out = bytearray(len(steps))
+        for i, step in enumerate(steps):
+            out[i] = 48 | step['cipher_bit']
+        return out.decode('ascii'), steps
+    
+    def iter_steps(self, data):
+        """
+        Đặt lại thanh ghi và trả về generator sinh lần lượt thông tin từng bước.
+        
+        Mỗi bước chỉ được tạo khi generator chạy tới, nên có thể gửi dần
+        kết quả đi mà không phải giữ toàn bộ danh sách bước trong bộ nhớ.
+        
+        Args:
+            data (str): Chuỗi nhị phân cần mã hóa/giải mã
+            
+        Returns:
+            generator: Các từ điển thông tin bước giống chế độ chi tiết
+        """
+        if _not_binary(data):
+            raise ValueError("Dữ liệu chỉ được chứa các ký tự 0 và 1")
         
-        for i, bit in enumerate(data):
-            step_info = {} if verbose else None
+        self.reset()
+        return self._generate_steps(data)
+    
+    def _generate_steps(self, data):
+        """Sinh thông tin từng bước; dùng qua iter_steps."""
+        # Mã hóa sang ASCII một lần: '0' = 48, '1' = 49 nên bit dữ liệu là bit thấp nhất của mỗi byte
+        for i, byte in enumerate(data.encode('ascii')):
+            step_info = {}
             keystream_bit = self.generate_bit(step_info)
             
             # XOR với bit dữ liệu
-            cipher_bit = int(bit) ^ keystream_bit
-            result.append(str(cipher_bit))
+            data_bit = byte & 1
+            step_info['data_bit'] = data_bit
+            step_info['cipher_bit'] = data_bit ^ keystream_bit
+            step_info['step'] = i
+            yield step_info
+    
+    def _xor_keystream(self, buf):
+        """
+        Chạy keystream từ trạng thái ban đầu và XOR thẳng vào từng byte ASCII của dữ liệu.
+        
+        Mỗi thanh ghi là một số nguyên, phép xoay là một lần tra bảng _ROT_X/_ROT_Y/_ROT_Z.
+        Vòng lặp chỉ cập nhật thanh ghi và ghi kết quả vào bytearray cấp phát sẵn,
+        không tạo thông tin bước hay chuỗi một ký tự nào.
+        
+        Args:
+            buf (bytes): Dữ liệu dạng ASCII '0'/'1'
             
-            if verbose:
-                step_info['data_bit'] = int(bit)
-                step_info['cipher_bit'] = cipher_bit
-                step_info['step'] = i
-                steps.append(step_info)
-        
-        result_dict = {
-            'result': ''.join(result),
-            'input': data,
-            'key': self.key
-        }
+        Returns:
+            bytearray: Kết quả dạng ASCII '0'/'1'
+        """
+        x, y, z = self._x0, self._y0, self._z0
+        out = bytearray(len(buf))
+        # Gán hằng số vào biến cục bộ để vòng lặp không phải tra cứu biến toàn cục
+        rot_x, rot_y, rot_z = _ROT_X, _ROT_Y, _ROT_Z
         
-        if verbose:
-            result_dict['steps'] = steps
-            result_dict['initial_state'] = initial_state
+        for i, b in enumerate(buf):
+            # Bit điều khiển x1, y3, z3 và hàm đa số
+            cx = (x >> X_CLOCK) & 1
+            cy = (y >> Y_CLOCK) & 1
+            cz = (z >> Z_CLOCK) & 1
+            m = (cx & cy) | (cx & cz) | (cy & cz)
+            
+            # Xoay có điều kiện, trạng thái mới tra từ bảng xoay
+            if cx == m:
+                x = rot_x[x]
+            if cy == m:
+                y = rot_y[y]
+            if cz == m:
+                z = rot_z[z]
+            
+            # '0'/'1' ⊕ s, với s = x5 ⊕ y7 ⊕ z8
+            out[i] = b ^ (((x >> X_OUT) ^ (y >> Y_OUT) ^ (z >> Z_OUT)) & 1)
+        
+        self._store_state(x, y, z)
+        return out
+    
+    def _store_state(self, x, y, z):
+        """Ghi trạng thái cuối của đường chạy nhanh vào các thanh ghi, nhất quán với đường chạy chi tiết."""
+        self.x, self.y, self.z = x, y, z
+    
+    def _encrypt_fast(self, data):
+        """
+        Mã hóa/giải mã không lưu từng bước.
+        
+        Bit dữ liệu được giữ nguyên dạng mã ASCII ('0' = 48, '1' = 49) nên phép XOR
+        với bit keystream cho ra trực tiếp ký tự '0'/'1' của kết quả, ghi vào một
+        bộ đệm cấp phát sẵn. Nếu đã dựng phần mở rộng C thì dùng nó; nếu không,
+        với dữ liệu dài cả vòng lặp được chạy bằng bản Numba nếu warm_up() đã biên dịch sẵn.
+        """
+        buf = data.encode('ascii')
+        
+        if _native_lib is not None:
+            return self._encrypt_native(buf)
         
-        return result_dict
+        if _numba_kernel is not None and len(buf) >= NUMBA_MIN_BITS:
+            out, x, y, z = _numba_kernel(self._x0, self._y0, self._z0,
+                                         np.frombuffer(buf, dtype=np.uint8))
+            self._store_state(x, y, z)
+            return out.tobytes().decode('ascii')
+        
+        return self._xor_keystream(buf).decode('ascii')
+    
+    def _encrypt_native(self, buf):
+        """Mã hóa/giải mã bộ đệm ASCII bằng phần mở rộng C (một lần gọi cho cả dữ liệu)."""
+        # Một mảng C cho cả ba thanh ghi: hàm C đọc trạng thái đầu và ghi lại trạng thái cuối
+        state = _native_ffi.new('uint32_t[3]', (self._x0, self._y0, self._z0))
+        out = bytearray(len(buf))
+        _native_lib.ks_xor(state, state + 1, state + 2, _native_ffi.from_buffer(buf),
+                           _native_ffi.from_buffer(out), len(buf))
+        self._store_state(state[0], state[1], state[2])
+        return out.decode('ascii')
     
     def get_register_state(self):
         """Lấy trạng thái hiện tại của tất cả các thanh ghi."""
         return {
-            'X': self.X.copy(),
-            'Y': self.Y.copy(),
-            'Z': self.Z.copy()
+            'X': list(_BITS_X[self.x]),
+            'Y': list(_BITS_Y[self.y]),
+            'Z': list(_BITS_Z[self.z])
         }
 
 
+def _clock_slices(r, taps, mask):
+    """
+    Xoay có điều kiện một thanh ghi đã cắt lát bit cho mọi luồng cùng lúc.
+    
+    r[k] là số nguyên chứa bit k của thanh ghi ở mọi luồng (bit j là luồng j);
+    chỉ các luồng có bit tương ứng trong mask bằng 1 được xoay.
+    """
+    t = 0
+    for i in taps:
+        t ^= r[i]
+    # Sau khi xoay: r0 = t, rk = r(k-1); chọn theo mặt nạ bằng v ^ ((s ^ v) & mask)
+    return [v ^ ((s ^ v) & mask) for s, v in zip([t] + r[:-1], r)]
+
+
+class TinyA51Bitsliced:
+    """
+    Chạy nhiều thể hiện TinyA5/1 độc lập (mỗi khóa một luồng) song song theo bit.
+    
+    Mỗi phần tử thanh ghi được lưu thành một số nguyên mà bit j là giá trị của
+    luồng j, nên mỗi phép &, ^ trên số nguyên đẩy tất cả các luồng đi một bước.
+    Số luồng không giới hạn, phù hợp khi mã hóa nhiều thông điệp ngắn với nhiều khóa.
+    """
+    __slots__ = ('keys', 'lanes', '_full', '_X0', '_Y0', '_Z0')
+    
+    def __init__(self, keys):
+        """
+        Args:
+            keys (list): Danh sách khóa 23 bit, mỗi khóa là một luồng
+        """
+        keys = list(keys)
+        if not keys:
+            raise ValueError("Cần ít nhất một khóa")
+        for key in keys:
+            valid, message = validate_key(key)
+            if not valid:
+                raise ValueError(message)
+        
+        self.keys = keys
+        self.lanes = len(keys)
+        self._full = (1 << self.lanes) - 1
+        
+        # Cột k của các khóa là phần tử k của thanh ghi ở mọi luồng; đảo chuỗi để luồng 0 là bit thấp nhất
+        slices = [int(''.join(column)[::-1], 2) for column in zip(*keys)]
+        self._X0 = slices[:X_LEN]
+        self._Y0 = slices[X_LEN:X_LEN + Y_LEN]
+        self._Z0 = slices[X_LEN + Y_LEN:]
+    
+    def keystream_words(self, n):
+        """
+        Sinh n từ keystream từ trạng thái ban đầu.
+        
+        Returns:
+            list: Từ thứ i chứa bit keystream thứ i của mọi luồng (bit j là luồng j)
+        """
+        X, Y, Z = self._X0, self._Y0, self._Z0
+        full = self._full
+        words = []
+        
+        for _ in range(n):
+            # Hàm đa số tính cho mọi luồng cùng lúc; luồng nào có bit điều khiển bằng đa số thì xoay
+            x1, y3, z3 = X[X_CLOCK], Y[Y_CLOCK], Z[Z_CLOCK]
+            m = (x1 & y3) | (x1 & z3) | (y3 & z3)
+            X = _clock_slices(X, X_TAPS, full ^ x1 ^ m)
+            Y = _clock_slices(Y, Y_TAPS, full ^ y3 ^ m)
+            Z = _clock_slices(Z, Z_TAPS, full ^ z3 ^ m)
+            words.append(X[X_OUT] ^ Y[Y_OUT] ^ Z[Z_OUT])
+        
+        return words
+    
+    def keystreams(self, n):
+        """
+        Sinh n bit keystream cho từng luồng.
+        
+        Returns:
+            list: Chuỗi nhị phân keystream của mỗi luồng, theo thứ tự khóa
+        """
+        if n == 0:
+            return [''] * self.lanes
+        
+        # Chuyển vị: mỗi từ thành một hàng ký tự (luồng 0 ở cuối), ghép theo cột
+        width = '0%db' % self.lanes
+        rows = [format(word, width) for word in self.keystream_words(n)]
+        return [''.join(column) for column in zip(*rows)][::-1]
+    
+    def encrypt_decrypt(self, messages):
+        """
+        Mã hóa hoặc giải mã mỗi thông điệp bằng khóa cùng vị trí.
+        
+        Args:
+            messages (list): Các chuỗi nhị phân, số lượng bằng số khóa (độ dài có thể khác nhau)
+            
+        Returns:
+            list: Các chuỗi kết quả theo thứ tự thông điệp
+        """
+        messages = list(messages)
+        if len(messages) != self.lanes:
+            raise ValueError("Số thông điệp phải bằng số khóa")
+        for data in messages:
+            if _not_binary(data):
+                raise ValueError("Dữ liệu chỉ được chứa các ký tự 0 và 1")
+        
+        n = max(map(len, messages))
+        results = []
+        for data, ks in zip(messages, self.keystreams(n)):
+            if data:
+                data = format(int(data, 2) ^ int(ks[:len(data)], 2), '0%db' % len(data))
+            results.append(data)
+        return results
+
+
+def warm_up():
+    """
+    Biên dịch trước bản Numba (nếu có) và bật nó cho dữ liệu dài.
+    
+    Gọi một lần khi khởi động máy chủ (xem wsgi.py); không gọi thì chỉ dùng Python thuần.
+    """
+    global _numba_kernel
+    if _native_lib is not None:
+        # Phần mở rộng C luôn được dùng trước nên bản Numba không bao giờ chạy tới
+        return
+    
+    kernel = _load_numba_kernel()
+    if kernel is not None:
+        kernel(0, 0, 0, np.zeros(1, dtype=np.uint8))
+        _numba_kernel = kernel
+
+
+# Bảng tra cứu ký tự A-H -> nhóm 3 bit, dựng một lần khi nạp mô-đun
+CHAR_TO_BITS = {c: format(i, '03b') for i, c in enumerate('ABCDEFGH')}
+
+# Mỗi nhóm 3 bit là đúng một chữ số hệ 8, nên chữ số 0-7 ứng với ký tự A-H
+_OCT_TO_CHAR = str.maketrans('01234567', 'ABCDEFGH')
+
+# Bảng str.translate thay mỗi ký tự A-H bằng nhóm 3 bit của nó
+_CHAR_TO_BITS_TABLE = str.maketrans(CHAR_TO_BITS)
+
+
+def _bits_to_chars(bits):
+    """
+    Chuyển chuỗi nhị phân hợp lệ (độ dài là bội số của 3) thành ký tự A-H qua số nguyên hệ 8.
+    
+    Không kiểm tra đầu vào; dùng cho dữ liệu đã biết chắc là hợp lệ.
+    """
+    if not bits:
+        return ''
+    return format(int(bits, 2), 'o').zfill(len(bits) // 3).translate(_OCT_TO_CHAR)
+
+
 def char_to_binary(text):
     """
     Chuyển đổi các ký tự A-H thành biểu diễn nhị phân 3 bit.
@@ -206,19 +624,13 @@ def char_to_binary(text):
     Returns:
         str: Biểu diễn nhị phân
     """
-    char_map = {
-        'A': '000', 'B': '001', 'C': '010', 'D': '011',
-        'E': '100', 'F': '101', 'G': '110', 'H': '111'
-    }
-    
-    result = []
-    for char in text.upper():
-        if char in char_map:
-            result.append(char_map[char])
-        else:
-            raise ValueError(f"Ký tự '{char}' không được hỗ trợ. Chỉ dùng A-H.")
-    
-    return ''.join(result)
+    # Kiểm tra trước: translate giữ nguyên ký tự không có trong bảng.
+    # Kiểm tra và chuyển cùng một chuỗi đã viết hoa (upper() có thể đổi độ dài, ví dụ 'ﬀ' -> 'FF')
+    text = text.upper()
+    invalid = text.translate(_CHAR_DEL)
+    if invalid:
+        raise ValueError(f"Ký tự '{invalid[0]}' không được hỗ trợ. Chỉ dùng A-H.")
+    return text.translate(_CHAR_TO_BITS_TABLE)
 
 
 def binary_to_char(binary):
@@ -234,41 +646,45 @@ def binary_to_char(binary):
     if len(binary) % 3 != 0:
         raise ValueError("Độ dài chuỗi nhị phân phải là bội số của 3")
     
-    char_map = {
-        '000': 'A', '001': 'B', '010': 'C', '011': 'D',
-        '100': 'E', '101': 'F', '110': 'G', '111': 'H'
-    }
-    
-    result = []
-    for i in range(0, len(binary), 3):
-        chunk = binary[i:i+3]
-        if chunk in char_map:
-            result.append(char_map[chunk])
-        else:
-            raise ValueError(f"Nhóm nhị phân không hợp lệ '{chunk}'")
-    
-    return ''.join(result)
+    invalid = binary.translate(_BIN_DEL)
+    if invalid:
+        # Báo lỗi theo nhóm 3 bit chứa ký tự không hợp lệ đầu tiên
+        start = binary.index(invalid[0]) // 3 * 3
+        raise ValueError(f"Nhóm nhị phân không hợp lệ '{binary[start:start + 3]}'")
+    return _bits_to_chars(binary)
 
 
 def validate_key(key):
-    """Kiểm tra khóa là chuỗi nhị phân 23 bit."""
+    """Kiểm tra khóa là chuỗi nhị phân 23 bit (kết quả với khóa dạng chuỗi được lưu đệm)."""
+    # Kiểm tra độ dài trước để bộ đệm chỉ giữ chuỗi 23 ký tự, không giữ khóa sai dài tùy ý
     if len(key) != 23:
         return False, f"Khóa phải dài chính xác 23 bit, hiện là {len(key)}"
-    if not all(c in '01' for c in key):
+    if isinstance(key, str):
+        return _validate_key_str(key)
+    
+    # Giá trị khác chuỗi (ví dụ đối tượng JSON) có thể không băm được nên không đưa vào bộ đệm
+    return False, "Khóa chỉ được chứa các ký tự 0 và 1"
+
+
+@lru_cache(maxsize=4096)
+def _validate_key_str(key):
+    """Phần kiểm tra của validate_key cho khóa dạng chuỗi 23 ký tự."""
+    if _not_binary(key):
         return False, "Khóa chỉ được chứa các ký tự 0 và 1"
     return True, "Khóa hợp lệ"
 
 
 def validate_binary_data(data):
     """Kiểm tra dữ liệu là chuỗi nhị phân."""
-    if not all(c in '01' for c in data):
+    # Giá trị khác chuỗi (ví dụ mảng/đối tượng JSON) không có encode nên loại ngay
+    if not isinstance(data, str) or _not_binary(data):
         return False, "Dữ liệu chỉ được chứa các ký tự 0 và 1"
     return True, "Dữ liệu nhị phân hợp lệ"
 
 
 def validate_char_data(data):
     """Kiểm tra dữ liệu chỉ chứa các ký tự A-H."""
-    if not all(c.upper() in 'ABCDEFGH' for c in data):
+    if not isinstance(data, str) or data.translate(_CHAR_DEL):
         return False, "Dữ liệu chỉ được chứa các ký tự A-H"
     return True, "Dữ liệu ký tự hợp lệ"
 
@@ -0,0 +1,12 @@
+"""
+Điểm vào WSGI cho môi trường triển khai.
+
+Chạy: gunicorn --preload -w $(nproc) -b 0.0.0.0:$PORT wsgi:application
+Với --preload, mô-đun được nạp (và bản Numba được biên dịch, nếu chưa dựng phần mở rộng C)
+một lần trong tiến trình chính trước khi tách các worker. `gunicorn app:app` vẫn chạy được.
+"""
+
+from app import app as application
+from tinya51 import warm_up
+
+warm_up()